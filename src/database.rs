@@ -1,19 +1,44 @@
 use anyhow::Result;
 use chrono::{DateTime, Utc};
-use rusqlite::{Connection, params};
+use rusqlite::{Connection, OpenFlags, TransactionBehavior, params};
 use serde::{Deserialize, Serialize};
+use std::fs::File;
+use std::io::{BufWriter, Write};
 use std::path::Path;
+use std::sync::mpsc;
+use std::thread;
+use std::time::{Duration, Instant};
 use tokio::sync::Mutex;
 use log::{info, error};
 
+/// zstd level used for stored page text
+const TEXT_COMPRESSION_LEVEL: i32 = 6;
+
+/// Characters of page text shown for a search hit
+const PREVIEW_CHARS: usize = 200;
+
+/// Characters of that preview taken from before the match
+const PREVIEW_CONTEXT: usize = 60;
+
+/// Prepared statements kept alive on the writer connection
+const WRITER_STATEMENT_CACHE: usize = 256;
+
+/// Text recovered from a single PDF page
+#[derive(Debug, Clone, Serialize, Deserialize)]
+pub struct PageText {
+    pub page_num: usize,
+    pub text: String,
+}
+
 #[derive(Debug, Clone, Serialize, Deserialize)]
 pub struct ExtractionResult {
     pub id: Option<i64>,
     pub file_path: String,
     pub file_hash: Option<String>,
     pub file_size: i64,
+    pub file_mtime: f64,
     pub extraction_method: String,
-    pub extracted_text: String,
+    pub pages: Vec<PageText>,
     pub page_count: i32,
     pub processing_time_seconds: f64,
     pub timestamp: DateTime<Utc>,
@@ -27,15 +52,34 @@ pub struct Database {
 
 impl Database {
     pub async fn new(path: &Path) -> Result<Self> {
-        let conn = Connection::open(path)?;
-        
-        // Enable WAL mode for better concurrency
-        conn.execute_batch(
-            "PRAGMA journal_mode=WAL;
-             PRAGMA synchronous=NORMAL;
-             PRAGMA cache_size=10000;
-             PRAGMA temp_store=memory;"
+        let conn = open_connection(path)?;
+        
+        Ok(Database {
+            conn: Mutex::new(conn),
+        })
+    }
+    
+    /// Open an existing database without modifying it, for query tools.
+    ///
+    /// The schema is created and upgraded only by the extractor.
+    pub async fn open_read_only(path: &Path) -> Result<Self> {
+        let conn = Connection::open_with_flags(
+            path,
+            OpenFlags::SQLITE_OPEN_READ_ONLY | OpenFlags::SQLITE_OPEN_NO_MUTEX,
         )?;
+        configure_connection(&conn)?;
+        
+        let has_index: bool = conn.query_row(
+            "SELECT EXISTS(SELECT 1 FROM sqlite_master WHERE name = 'pdf_pages_fts')",
+            [],
+            |row| row.get(0),
+        )?;
+        if !has_index {
+            anyhow::bail!(
+                "{} has no page index yet; run pdf-ocr-extractor once to create or upgrade it",
+                path.display()
+            );
+        }
         
         Ok(Database {
             conn: Mutex::new(conn),
@@ -43,7 +87,7 @@ impl Database {
     }
     
     pub async fn init_schema(&self) -> Result<()> {
-        let conn = self.conn.lock().await;
+        let mut conn = self.conn.lock().await;
         
         conn.execute(
             r#"
@@ -52,9 +96,10 @@ impl Database {
                 file_path TEXT NOT NULL,
                 file_hash TEXT,
                 file_size INTEGER,
+                file_mtime REAL,
                 extraction_method TEXT NOT NULL,
-                extracted_text TEXT,
                 page_count INTEGER,
+                text_length INTEGER,
                 processing_time_seconds REAL,
                 timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
                 success BOOLEAN NOT NULL,
@@ -65,82 +110,69 @@ impl Database {
             [],
         )?;
         
-        // Create indexes
+        // Databases created before per-page storage lack the aggregate column
+        add_column_if_missing(&conn, "pdf_extractions", "text_length", "INTEGER")?;
+        add_column_if_missing(&conn, "pdf_extractions", "file_mtime", "REAL")?;
+        
+        // Page text lives in its own table so no row holds a whole document
+        conn.execute(
+            r#"
+            CREATE TABLE IF NOT EXISTS pdf_pages (
+                extraction_id INTEGER NOT NULL,
+                page_num INTEGER NOT NULL,
+                text BLOB,
+                PRIMARY KEY (extraction_id, page_num)
+            )
+            "#,
+            [],
+        )?;
+        
+        // Lets unchanged files be skipped from a stat() alone; it also serves
+        // file_path lookups and ordering, so the old single-column index goes
         conn.execute(
-            "CREATE INDEX IF NOT EXISTS idx_file_path ON pdf_extractions(file_path)",
+            "CREATE INDEX IF NOT EXISTS idx_size_mtime ON pdf_extractions(file_path, file_size, file_mtime)",
             [],
         )?;
         
+        conn.execute("DROP INDEX IF EXISTS idx_file_path", [])?;
+        
+        // Serves list filters on method and success plus the timestamp sort;
+        // it also covers the old single-column method index
         conn.execute(
-            "CREATE INDEX IF NOT EXISTS idx_extraction_method ON pdf_extractions(extraction_method)",
+            "CREATE INDEX IF NOT EXISTS idx_method_success_ts ON pdf_extractions(extraction_method, success, timestamp DESC)",
             [],
         )?;
         
+        conn.execute("DROP INDEX IF EXISTS idx_extraction_method", [])?;
+        
         conn.execute(
             "CREATE INDEX IF NOT EXISTS idx_timestamp ON pdf_extractions(timestamp)",
             [],
         )?;
         
-        info!("Database schema initialized");
-        Ok(())
-    }
-    
-    pub async fn insert_result(&self, result: &ExtractionResult) -> Result<()> {
-        let conn = self.conn.lock().await;
+        // Successful rows newest first, for listings without a method filter
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_success_ts ON pdf_extractions(timestamp DESC) WHERE success = 1",
+            [],
+        )?;
         
+        // Full-text index over page text. It is contentless: insert_batch
+        // feeds it the plain text it already holds, and search decompresses
+        // matching pages itself, so no SQL function is needed to read pages.
         conn.execute(
             r#"
-            INSERT OR REPLACE INTO pdf_extractions 
-            (file_path, file_hash, file_size, extraction_method, extracted_text, 
-             page_count, processing_time_seconds, success, error_message)
-            VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?7, ?8, ?9)
+            CREATE VIRTUAL TABLE IF NOT EXISTS pdf_pages_fts USING fts5(
+                text,
+                content='',
+                tokenize='unicode61 remove_diacritics 2'
+            )
             "#,
-            params![
-                result.file_path,
-                result.file_hash,
-                result.file_size,
-                result.extraction_method,
-                result.extracted_text,
-                result.page_count,
-                result.processing_time_seconds,
-                result.success,
-                result.error_message,
-            ],
+            [],
         )?;
         
-        Ok(())
-    }
-    
-    pub async fn batch_insert(&self, results: &[ExtractionResult]) -> Result<()> {
-        let conn = self.conn.lock().await;
-        let tx = conn.unchecked_transaction()?;
-        
-        {
-            let mut stmt = tx.prepare(
-                r#"
-                INSERT OR REPLACE INTO pdf_extractions 
-                (file_path, file_hash, file_size, extraction_method, extracted_text, 
-                 page_count, processing_time_seconds, success, error_message)
-                VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?7, ?8, ?9)
-                "#,
-            )?;
-            
-            for result in results {
-                stmt.execute(params![
-                    result.file_path,
-                    result.file_hash,
-                    result.file_size,
-                    result.extraction_method,
-                    result.extracted_text,
-                    result.page_count,
-                    result.processing_time_seconds,
-                    result.success,
-                    result.error_message,
-                ])?;
-            }
-        }
+        migrate_legacy_text(&mut conn)?;
         
-        tx.commit()?;
+        info!("Database schema initialized");
         Ok(())
     }
     
@@ -158,65 +190,166 @@ impl Database {
         Ok(count > 0)
     }
     
-    pub async fn get_stats(&self) -> Result<DatabaseStats> {
+    /// Whether a complete extraction exists for this exact path, size and mtime.
+    ///
+    /// Rows with no text or only partial direct text are not complete, since
+    /// a later run with OCR available may do better. With `ocr_only` only
+    /// OCR results count.
+    pub async fn is_unchanged(
+        &self,
+        file_path: &str,
+        file_size: i64,
+        file_mtime: f64,
+        ocr_only: bool,
+    ) -> Result<bool> {
         let conn = self.conn.lock().await;
         
-        let total: i64 = conn.query_row(
-            "SELECT COUNT(*) FROM pdf_extractions",
-            [],
-            |row| row.get(0)
+        let mut stmt = conn.prepare_cached(
+            r#"
+            SELECT 1 FROM pdf_extractions
+            WHERE file_path = ?1 AND file_size = ?2 AND file_mtime = ?3
+              AND success = 1 AND text_length > 0
+              AND extraction_method <> 'direct_partial'
+              AND (?4 = 0 OR extraction_method = 'ocr')
+            LIMIT 1
+            "#,
         )?;
         
-        let successful: i64 = conn.query_row(
-            "SELECT COUNT(*) FROM pdf_extractions WHERE success = 1",
+        Ok(stmt.exists(params![file_path, file_size, file_mtime, ocr_only])?)
+    }
+    
+    pub async fn get_stats(&self) -> Result<DatabaseStats> {
+        let conn = self.conn.lock().await;
+        
+        // One pass over the table for every aggregate
+        let (total, successful, avg_time, avg_size, min_size, max_size) = conn.query_row(
+            r#"
+            SELECT COUNT(*),
+                   COALESCE(SUM(success), 0),
+                   AVG(CASE WHEN success THEN processing_time_seconds END),
+                   AVG(CASE WHEN success THEN file_size END),
+                   MIN(CASE WHEN success THEN file_size END),
+                   MAX(CASE WHEN success THEN file_size END)
+            FROM pdf_extractions
+            "#,
             [],
-            |row| row.get(0)
+            |row| {
+                Ok((
+                    row.get::<_, i64>(0)?,
+                    row.get::<_, i64>(1)?,
+                    row.get::<_, Option<f64>>(2)?,
+                    row.get::<_, Option<f64>>(3)?,
+                    row.get::<_, Option<i64>>(4)?,
+                    row.get::<_, Option<i64>>(5)?,
+                ))
+            },
         )?;
         
-        let failed = total - successful;
+        let mut stmt = conn.prepare(
+            r#"
+            SELECT extraction_method, COUNT(*)
+            FROM pdf_extractions
+            GROUP BY extraction_method
+            ORDER BY COUNT(*) DESC
+            "#,
+        )?;
         
-        let avg_time: f64 = conn.query_row(
-            "SELECT AVG(processing_time_seconds) FROM pdf_extractions WHERE success = 1",
-            [],
-            |row| row.get(0)
-        ).unwrap_or(0.0);
+        let methods = stmt
+            .query_map([], |row| Ok((row.get(0)?, row.get(1)?)))?
+            .collect::<rusqlite::Result<Vec<(String, i64)>>>()?;
         
         Ok(DatabaseStats {
             total,
             successful,
-            failed,
-            avg_processing_time: avg_time,
+            failed: total - successful,
+            avg_processing_time: avg_time.unwrap_or(0.0),
+            avg_file_size: avg_size.unwrap_or(0.0),
+            min_file_size: min_size.unwrap_or(0),
+            max_file_size: max_size.unwrap_or(0),
+            methods,
         })
     }
     
-    pub async fn search_text(&self, query: &str, limit: usize) -> Result<Vec<SearchResult>> {
+    /// List extractions newest first, optionally filtered by method
+    pub async fn list_files(&self, method: Option<&str>, include_failed: bool) -> Result<Vec<FileListing>> {
         let conn = self.conn.lock().await;
         
-        let mut stmt = conn.prepare(
+        // Conditions are only added when used so the planner can pick the
+        // matching index instead of evaluating `?1 IS NULL OR ...`
+        let mut conditions = Vec::new();
+        if method.is_some() {
+            conditions.push("extraction_method = ?1");
+        }
+        if !include_failed {
+            conditions.push("success = 1");
+        }
+        
+        let where_clause = if conditions.is_empty() {
+            String::new()
+        } else {
+            format!("WHERE {}", conditions.join(" AND "))
+        };
+        
+        let mut stmt = conn.prepare(&format!(
             r#"
-            SELECT file_path, extraction_method, 
-                   substr(extracted_text, 1, 200) as preview,
-                   timestamp
-            FROM pdf_extractions 
-            WHERE extracted_text LIKE ?1 AND success = 1
+            SELECT file_path, extraction_method, page_count, processing_time_seconds,
+                   success, error_message, timestamp
+            FROM pdf_extractions
+            {}
             ORDER BY timestamp DESC
-            LIMIT ?2
             "#,
-        )?;
+            where_clause,
+        ))?;
         
-        let query_param = format!("%{}%", query);
-        let results = stmt.query_map(params![query_param, limit], |row| {
-            Ok(SearchResult {
+        let map_row = |row: &rusqlite::Row<'_>| {
+            Ok(FileListing {
                 file_path: row.get(0)?,
                 extraction_method: row.get(1)?,
-                preview: row.get(2)?,
-                timestamp: row.get(3)?,
+                page_count: row.get(2)?,
+                processing_time_seconds: row.get(3)?,
+                success: row.get(4)?,
+                error_message: row.get(5)?,
+                timestamp: row.get(6)?,
             })
-        })?;
+        };
+        
+        let listings = match method {
+            Some(method) => stmt.query_map(params![method], map_row)?.collect::<rusqlite::Result<Vec<_>>>()?,
+            None => stmt.query_map([], map_row)?.collect::<rusqlite::Result<Vec<_>>>()?,
+        };
+        
+        Ok(listings)
+    }
+    
+    pub async fn search_text(&self, query: &str, limit: usize) -> Result<Vec<SearchResult>> {
+        let conn = self.conn.lock().await;
+        
+        let mut stmt = conn.prepare(
+            r#"
+            SELECT e.file_path, e.extraction_method, p.page_num, p.text, e.timestamp
+            FROM pdf_pages_fts
+            JOIN pdf_pages p ON p.rowid = pdf_pages_fts.rowid
+            JOIN pdf_extractions e ON e.id = p.extraction_id
+            WHERE pdf_pages_fts MATCH ?1 AND e.success = 1
+            ORDER BY rank
+            LIMIT ?2
+            "#,
+        )?;
         
+        let mut rows = stmt.query(params![fts_phrase(query), limit])?;
         let mut search_results = Vec::new();
-        for result in results {
-            search_results.push(result?);
+        
+        // Only the matching pages are decompressed, to build their previews
+        while let Some(row) = rows.next()? {
+            let text = decompress_text(row.get_ref(3)?.as_blob()?)?;
+            
+            search_results.push(SearchResult {
+                file_path: row.get(0)?,
+                extraction_method: row.get(1)?,
+                page_num: row.get(2)?,
+                preview: search_preview(&text, query),
+                timestamp: row.get(4)?,
+            });
         }
         
         Ok(search_results)
@@ -225,54 +358,519 @@ impl Database {
     pub async fn export_to_text(&self, output_path: &Path) -> Result<()> {
         let conn = self.conn.lock().await;
         
+        // Ordered by idx_size_mtime, so rows stream without a sort
         let mut stmt = conn.prepare(
             r#"
-            SELECT file_path, extraction_method, extracted_text, success, error_message, timestamp
-            FROM pdf_extractions 
+            SELECT id, file_path, extraction_method, success, error_message, timestamp
+            FROM pdf_extractions
             ORDER BY file_path
             "#,
         )?;
         
-        let results = stmt.query_map([], |row| {
-            Ok((
-                row.get::<_, String>(0)?,  // file_path
-                row.get::<_, String>(1)?,  // extraction_method
-                row.get::<_, String>(2)?,  // extracted_text
-                row.get::<_, bool>(3)?,    // success
-                row.get::<_, Option<String>>(4)?, // error_message
-                row.get::<_, String>(5)?,  // timestamp
-            ))
-        })?;
+        // Write records as they are read; only one document is held at a time
+        let separator = "=".repeat(80);
+        let mut out = BufWriter::new(File::create(output_path)?);
+        writeln!(out, "PDF Text Extraction Results (Rust Edition)")?;
+        writeln!(out, "{}\n", separator)?;
         
-        let mut content = String::new();
-        content.push_str("PDF Text Extraction Results (Rust Edition)\n");
-        content.push_str(&"=".repeat(80));
-        content.push_str("\n\n");
-        
-        for result in results {
-            let (file_path, method, text, success, error, timestamp) = result?;
+        let mut rows = stmt.query([])?;
+        while let Some(row) = rows.next()? {
+            let id: i64 = row.get(0)?;
+            let file_path: String = row.get(1)?;
+            let method: String = row.get(2)?;
+            let success: bool = row.get(3)?;
+            let error: Option<String> = row.get(4)?;
+            let timestamp: String = row.get(5)?;
             
-            content.push_str(&format!("FILE: {}\n", file_path));
-            content.push_str(&format!("METHOD: {}\n", method));
-            content.push_str(&format!("SUCCESS: {}\n", success));
-            content.push_str(&format!("TIMESTAMP: {}\n", timestamp));
-            content.push_str(&"=".repeat(80));
-            content.push_str("\n");
+            writeln!(out, "FILE: {}", file_path)?;
+            writeln!(out, "METHOD: {}", method)?;
+            writeln!(out, "SUCCESS: {}", success)?;
+            writeln!(out, "TIMESTAMP: {}", timestamp)?;
+            writeln!(out, "{}", separator)?;
             
-            if success && !text.is_empty() {
-                content.push_str(&text);
+            let text = if success { document_text(&conn, id, &method)? } else { None };
+            if let Some(text) = text {
+                out.write_all(text.as_bytes())?;
             } else if let Some(error_msg) = error {
-                content.push_str(&format!("ERROR: {}\n", error_msg));
+                writeln!(out, "ERROR: {}", error_msg)?;
             }
             
-            content.push_str("\n");
-            content.push_str(&"=".repeat(80));
-            content.push_str("\n\n");
+            writeln!(out)?;
+            writeln!(out, "{}\n", separator)?;
         }
         
-        tokio::fs::write(output_path, content).await?;
+        out.flush()?;
         Ok(())
     }
+    
+    /// Stream every record to `output_path` as a JSON array, returning the count
+    pub async fn export_json(&self, output_path: &Path, include_text: bool) -> Result<usize> {
+        let conn = self.conn.lock().await;
+        
+        let mut stmt = conn.prepare(
+            r#"
+            SELECT id, file_path, file_hash, file_size, extraction_method, page_count,
+                   text_length, processing_time_seconds, timestamp, success,
+                   error_message
+            FROM pdf_extractions
+            ORDER BY file_path
+            "#,
+        )?;
+        
+        let mut rows = stmt.query([])?;
+        let mut out = BufWriter::new(File::create(output_path)?);
+        let mut count = 0;
+        
+        out.write_all(b"[")?;
+        while let Some(row) = rows.next()? {
+            let extraction_method: String = row.get(4)?;
+            
+            // Only pay for reading and decompressing pages when text is wanted
+            let extracted_text = if include_text {
+                document_text(&conn, row.get(0)?, &extraction_method)?
+            } else {
+                None
+            };
+            
+            let record = ExportRecord {
+                file_path: row.get(1)?,
+                file_hash: row.get(2)?,
+                file_size: row.get(3)?,
+                extraction_method,
+                page_count: row.get(5)?,
+                text_length: row.get(6)?,
+                processing_time_seconds: row.get(7)?,
+                timestamp: row.get(8)?,
+                success: row.get(9)?,
+                error_message: row.get(10)?,
+                extracted_text,
+            };
+            
+            if count > 0 {
+                out.write_all(b",")?;
+            }
+            out.write_all(b"\n")?;
+            serde_json::to_writer(&mut out, &record)?;
+            count += 1;
+        }
+        out.write_all(b"\n]\n")?;
+        
+        out.flush()?;
+        Ok(count)
+    }
+}
+
+/// Open a connection with the tuned PRAGMAs every handle should share
+pub fn open_connection(path: &Path) -> Result<Connection> {
+    let conn = Connection::open(path)?;
+    configure_connection(&conn)?;
+    
+    // WAL lets readers run alongside the writer; it is meaningless in memory
+    if path != Path::new(":memory:") {
+        conn.execute_batch("PRAGMA journal_mode=WAL;")?;
+    }
+    
+    conn.execute_batch("PRAGMA synchronous=NORMAL;")?;
+    
+    Ok(conn)
+}
+
+/// Settings that apply to read-only handles as well as writable ones
+fn configure_connection(conn: &Connection) -> Result<()> {
+    // Wait on locks held by other handles instead of failing with SQLITE_BUSY
+    conn.busy_timeout(Duration::from_millis(30_000))?;
+    
+    conn.execute_batch(
+        "PRAGMA cache_size=-65536;
+         PRAGMA temp_store=MEMORY;"
+    )?;
+    
+    Ok(())
+}
+
+/// Compress page text for storage
+fn compress_text(text: &str) -> Result<Vec<u8>> {
+    Ok(zstd::bulk::compress(text.as_bytes(), TEXT_COMPRESSION_LEVEL)?)
+}
+
+/// Decompress page text read from pdf_pages
+fn decompress_text(blob: &[u8]) -> Result<String> {
+    Ok(String::from_utf8(zstd::decode_all(blob)?)?)
+}
+
+/// Reassemble an extraction's pages in order, each headed by the same
+/// `--- Page N ---` marker the single-column schema stored
+fn document_text(conn: &Connection, extraction_id: i64, method: &str) -> Result<Option<String>> {
+    let mut stmt = conn.prepare_cached(
+        "SELECT page_num, text FROM pdf_pages WHERE extraction_id = ?1 ORDER BY page_num",
+    )?;
+    
+    let marker_suffix = if method == "ocr" { " (OCR)" } else { "" };
+    let mut document: Option<String> = None;
+    let mut rows = stmt.query(params![extraction_id])?;
+    
+    while let Some(row) = rows.next()? {
+        let page_num: i64 = row.get(0)?;
+        let page_text = decompress_text(row.get_ref(1)?.as_blob()?)?;
+        
+        let text = document.get_or_insert_with(String::new);
+        text.push_str(&format!("--- Page {}{} ---\n", page_num, marker_suffix));
+        text.push_str(&page_text);
+        text.push_str("\n\n");
+    }
+    
+    Ok(document)
+}
+
+/// Excerpt of page text around the first occurrence of `query`, with the
+/// match in brackets. Hits the index only made through diacritic folding or
+/// across line breaks show the start of the page instead.
+fn search_preview(text: &str, query: &str) -> String {
+    let text = text.trim();
+    
+    let Some(start) = find_ignore_ascii_case(text, query.trim()) else {
+        return match text.char_indices().nth(PREVIEW_CHARS) {
+            Some((end, _)) => format!("{}...", &text[..end]),
+            None => text.to_string(),
+        };
+    };
+    let end = start + query.trim().len();
+    
+    let head = text[..start]
+        .char_indices()
+        .rev()
+        .nth(PREVIEW_CONTEXT - 1)
+        .map_or(0, |(index, _)| index);
+    let tail = text[end..]
+        .char_indices()
+        .nth(PREVIEW_CHARS - PREVIEW_CONTEXT)
+        .map_or(text.len(), |(index, _)| end + index);
+    
+    format!(
+        "{}{}[{}]{}{}",
+        if head > 0 { "..." } else { "" },
+        &text[head..start],
+        &text[start..end],
+        &text[end..tail],
+        if tail < text.len() { "..." } else { "" },
+    )
+}
+
+/// Byte offset of the first ASCII-case-insensitive occurrence of `needle`
+fn find_ignore_ascii_case(haystack: &str, needle: &str) -> Option<usize> {
+    if needle.is_empty() {
+        return None;
+    }
+    
+    let bytes = haystack.as_bytes();
+    (0..=bytes.len().checked_sub(needle.len())?).find(|&start| {
+        let end = start + needle.len();
+        haystack.is_char_boundary(start)
+            && haystack.is_char_boundary(end)
+            && bytes[start..end].eq_ignore_ascii_case(needle.as_bytes())
+    })
+}
+
+/// Quote user input as a single FTS5 phrase so punctuation is not parsed as syntax
+fn fts_phrase(query: &str) -> String {
+    format!("\"{}\"", query.replace('"', "\"\""))
+}
+
+/// Add a column to an existing table if an older schema lacks it
+fn add_column_if_missing(conn: &Connection, table: &str, column: &str, definition: &str) -> Result<()> {
+    let mut stmt = conn.prepare(&format!("PRAGMA table_info({})", table))?;
+    let exists = stmt
+        .query_map([], |row| row.get::<_, String>(1))?
+        .filter_map(|name| name.ok())
+        .any(|name| name == column);
+    
+    if !exists {
+        conn.execute(&format!("ALTER TABLE {} ADD COLUMN {} {}", table, column, definition), [])?;
+    }
+    
+    Ok(())
+}
+
+/// Move text from the single `extracted_text` column of older databases
+/// into pdf_pages, then drop the column so this only runs once
+fn migrate_legacy_text(conn: &mut Connection) -> Result<()> {
+    let has_legacy_column = conn
+        .prepare("PRAGMA table_info(pdf_extractions)")?
+        .query_map([], |row| row.get::<_, String>(1))?
+        .filter_map(|name| name.ok())
+        .any(|name| name == "extracted_text");
+    
+    if !has_legacy_column {
+        return Ok(());
+    }
+    
+    info!("Moving stored text into per-page rows");
+    let tx = conn.transaction_with_behavior(TransactionBehavior::Immediate)?;
+    let mut migrated = 0;
+    
+    {
+        let mut select = tx.prepare(
+            "SELECT id, extracted_text FROM pdf_extractions WHERE extracted_text IS NOT NULL",
+        )?;
+        let mut text_lengths = Vec::new();
+        let mut rows = select.query([])?;
+        while let Some(row) = rows.next()? {
+            let id: i64 = row.get(0)?;
+            let text: String = row.get(1)?;
+            
+            let pages = split_legacy_pages(&text);
+            let text_length: usize = pages.iter().map(|page| page.text.chars().count()).sum();
+            for page in &pages {
+                insert_page(&tx, id, page)?;
+            }
+            
+            text_lengths.push((id, text_length as i64));
+            migrated += 1;
+        }
+        
+        let mut set_length = tx.prepare("UPDATE pdf_extractions SET text_length = ?2 WHERE id = ?1")?;
+        for (id, text_length) in text_lengths {
+            set_length.execute(params![id, text_length])?;
+        }
+    }
+    
+    tx.execute("ALTER TABLE pdf_extractions DROP COLUMN extracted_text", [])?;
+    tx.commit()?;
+    
+    info!("Moved text of {} extractions into pdf_pages", migrated);
+    Ok(())
+}
+
+/// Split text stored by the single-column schema on its `--- Page N ---`
+/// markers. Text without markers (the pdf-extract fallback) becomes page 1.
+fn split_legacy_pages(text: &str) -> Vec<PageText> {
+    let mut pages: Vec<PageText> = Vec::new();
+    
+    for line in text.split_inclusive('\n') {
+        // Page numbers only ever increased, so a marker-like line that does
+        // not continue the sequence is part of the page text
+        let marker = legacy_page_marker(line)
+            .filter(|&page_num| pages.last().map_or(true, |last| page_num > last.page_num));
+        
+        if let Some(page_num) = marker {
+            pages.push(PageText { page_num, text: String::new() });
+        } else if let Some(page) = pages.last_mut() {
+            page.text.push_str(line);
+        } else {
+            return vec![PageText { page_num: 1, text: text.to_string() }];
+        }
+    }
+    
+    // Each page was followed by a blank line before the next marker
+    for page in &mut pages {
+        if let Some(stripped) = page.text.strip_suffix("\n\n") {
+            page.text.truncate(stripped.len());
+        }
+    }
+    
+    pages
+}
+
+/// Page number from a `--- Page N ---` or `--- Page N (OCR) ---` line
+fn legacy_page_marker(line: &str) -> Option<usize> {
+    line.trim_end()
+        .strip_prefix("--- Page ")?
+        .strip_suffix(" ---")?
+        .trim_end_matches(" (OCR)")
+        .parse()
+        .ok()
+}
+
+/// Store one page compressed and add its plain text to the full-text index
+fn insert_page(conn: &Connection, extraction_id: i64, page: &PageText) -> Result<()> {
+    let mut store = conn.prepare_cached(
+        "INSERT INTO pdf_pages (extraction_id, page_num, text) VALUES (?1, ?2, ?3)",
+    )?;
+    let rowid = store.insert(params![extraction_id, page.page_num as i64, compress_text(&page.text)?])?;
+    
+    let mut index = conn.prepare_cached("INSERT INTO pdf_pages_fts(rowid, text) VALUES (?1, ?2)")?;
+    index.execute(params![rowid, page.text])?;
+    
+    Ok(())
+}
+
+/// Insert a batch of results inside a single write transaction
+fn insert_batch(conn: &mut Connection, results: &[ExtractionResult]) -> Result<()> {
+    let tx = conn.transaction_with_behavior(TransactionBehavior::Immediate)?;
+    
+    // Cached statements are compiled once per connection and reused by every
+    // batch the writer commits
+    {
+        // Pages of a row about to be replaced would otherwise be orphaned.
+        // Rows hashed before digests were tagged with their algorithm (no ':'
+        // in file_hash) describe the same file, so they are replaced too
+        // rather than counting the file twice.
+        let mut old_pages = tx.prepare_cached(
+            r#"
+            SELECT p.rowid, p.text FROM pdf_pages p
+            JOIN pdf_extractions e ON e.id = p.extraction_id
+            WHERE e.file_path = ?1 AND (e.file_hash = ?2 OR instr(e.file_hash, ':') = 0)
+            "#,
+        )?;
+        
+        // A contentless index can only drop a row given the text it indexed
+        let mut unindex_page = tx.prepare_cached(
+            "INSERT INTO pdf_pages_fts(pdf_pages_fts, rowid, text) VALUES ('delete', ?1, ?2)",
+        )?;
+        
+        let mut delete_pages = tx.prepare_cached(
+            r#"
+            DELETE FROM pdf_pages WHERE extraction_id IN
+                (SELECT id FROM pdf_extractions
+                 WHERE file_path = ?1 AND (file_hash = ?2 OR instr(file_hash, ':') = 0))
+            "#,
+        )?;
+        
+        let mut delete_legacy = tx.prepare_cached(
+            "DELETE FROM pdf_extractions WHERE file_path = ?1 AND instr(file_hash, ':') = 0",
+        )?;
+        
+        let mut insert_extraction = tx.prepare_cached(
+            r#"
+            INSERT OR REPLACE INTO pdf_extractions 
+            (file_path, file_hash, file_size, file_mtime, extraction_method, page_count, 
+             text_length, processing_time_seconds, success, error_message)
+            VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?7, ?8, ?9, ?10)
+            "#,
+        )?;
+        
+        for result in results {
+            let text_length: usize = result.pages.iter().map(|page| page.text.chars().count()).sum();
+            
+            let replaced = old_pages
+                .query_map(params![result.file_path, result.file_hash], |row| {
+                    Ok((row.get::<_, i64>(0)?, row.get::<_, Vec<u8>>(1)?))
+                })?
+                .collect::<rusqlite::Result<Vec<_>>>()?;
+            for (rowid, compressed) in replaced {
+                unindex_page.execute(params![rowid, decompress_text(&compressed)?])?;
+            }
+            
+            delete_pages.execute(params![result.file_path, result.file_hash])?;
+            delete_legacy.execute(params![result.file_path])?;
+            let extraction_id = insert_extraction.insert(params![
+                result.file_path,
+                result.file_hash,
+                result.file_size,
+                result.file_mtime,
+                result.extraction_method,
+                result.page_count,
+                text_length as i64,
+                result.processing_time_seconds,
+                result.success,
+                result.error_message,
+            ])?;
+            
+            for page in &result.pages {
+                insert_page(&tx, extraction_id, page)?;
+            }
+        }
+    }
+    
+    tx.commit()?;
+    Ok(())
+}
+
+/// Single background thread that owns the write connection.
+///
+/// Workers hand finished results over a channel; the writer commits them in
+/// batches so no worker ever waits on SQLite.
+pub struct ResultWriter {
+    sender: mpsc::Sender<ExtractionResult>,
+    handle: thread::JoinHandle<Result<usize>>,
+}
+
+impl ResultWriter {
+    pub fn spawn(path: &Path, batch_size: usize, flush_interval: Duration) -> Result<Self> {
+        let conn = open_connection(path)?;
+        conn.set_prepared_statement_cache_capacity(WRITER_STATEMENT_CACHE);
+        let (sender, receiver) = mpsc::channel();
+        
+        let handle = thread::Builder::new()
+            .name("db-writer".to_string())
+            .spawn(move || write_loop(conn, receiver, batch_size, flush_interval))?;
+        
+        Ok(Self { sender, handle })
+    }
+    
+    /// Cloneable handle for worker tasks to submit results
+    pub fn sender(&self) -> mpsc::Sender<ExtractionResult> {
+        self.sender.clone()
+    }
+    
+    /// Flush outstanding results and wait for the writer to exit
+    pub fn finish(self) -> Result<usize> {
+        let Self { sender, handle } = self;
+        drop(sender);
+        
+        handle
+            .join()
+            .map_err(|_| anyhow::anyhow!("Database writer thread panicked"))?
+    }
+}
+
+fn write_loop(
+    mut conn: Connection,
+    receiver: mpsc::Receiver<ExtractionResult>,
+    batch_size: usize,
+    flush_interval: Duration,
+) -> Result<usize> {
+    let mut batch = Vec::with_capacity(batch_size);
+    let mut written = 0;
+    let mut deadline = Instant::now() + flush_interval;
+    
+    loop {
+        let timeout = deadline.saturating_duration_since(Instant::now());
+        let disconnected = match receiver.recv_timeout(timeout) {
+            Ok(result) => {
+                batch.push(result);
+                if batch.len() < batch_size {
+                    continue;
+                }
+                false
+            }
+            Err(mpsc::RecvTimeoutError::Timeout) => false,
+            Err(mpsc::RecvTimeoutError::Disconnected) => true,
+        };
+        
+        if !batch.is_empty() {
+            if let Err(e) = insert_batch(&mut conn, &batch) {
+                error!("Failed to write {} results: {}", batch.len(), e);
+            } else {
+                written += batch.len();
+            }
+            batch.clear();
+        }
+        
+        if disconnected {
+            info!("Database writer stored {} results", written);
+            return Ok(written);
+        }
+        
+        deadline = Instant::now() + flush_interval;
+    }
+}
+
+/// One row of the JSON export
+#[derive(Debug, Serialize)]
+struct ExportRecord {
+    file_path: String,
+    file_hash: Option<String>,
+    file_size: Option<i64>,
+    extraction_method: String,
+    page_count: Option<i64>,
+    text_length: Option<i64>,
+    processing_time_seconds: Option<f64>,
+    timestamp: String,
+    success: bool,
+    error_message: Option<String>,
+    #[serde(skip_serializing_if = "Option::is_none")]
+    extracted_text: Option<String>,
 }
 
 #[derive(Debug)]
@@ -281,12 +879,160 @@ pub struct DatabaseStats {
     pub successful: i64,
     pub failed: i64,
     pub avg_processing_time: f64,
+    pub avg_file_size: f64,
+    pub min_file_size: i64,
+    pub max_file_size: i64,
+    /// (extraction_method, count), most common first
+    pub methods: Vec<(String, i64)>,
+}
+
+#[derive(Debug)]
+pub struct FileListing {
+    pub file_path: String,
+    pub extraction_method: String,
+    pub page_count: Option<i64>,
+    pub processing_time_seconds: Option<f64>,
+    pub success: bool,
+    pub error_message: Option<String>,
+    pub timestamp: String,
 }
 
 #[derive(Debug)]
 pub struct SearchResult {
     pub file_path: String,
     pub extraction_method: String,
+    pub page_num: i64,
     pub preview: String,
     pub timestamp: String,
-}
\ No newline at end of file
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    
+    fn page_nums(pages: &[PageText]) -> Vec<usize> {
+        pages.iter().map(|page| page.page_num).collect()
+    }
+    
+    #[test]
+    fn split_marked_pages() {
+        let pages = split_legacy_pages("--- Page 1 ---\nfirst\n\n--- Page 3 ---\nthird\nline\n\n\n");
+        
+        assert_eq!(page_nums(&pages), vec![1, 3]);
+        assert_eq!(pages[0].text, "first");
+        assert_eq!(pages[1].text, "third\nline\n");
+    }
+    
+    #[test]
+    fn split_ocr_markers() {
+        let pages = split_legacy_pages("--- Page 1 (OCR) ---\nscanned\n\n--- Page 2 (OCR) ---\nmore\n\n");
+        
+        assert_eq!(page_nums(&pages), vec![1, 2]);
+        assert_eq!(pages[1].text, "more");
+    }
+    
+    #[test]
+    fn split_unmarked_text_is_one_page() {
+        let text = "pdf-extract output\n--- Page 2 ---\nstill the same page";
+        let pages = split_legacy_pages(text);
+        
+        assert_eq!(page_nums(&pages), vec![1]);
+        assert_eq!(pages[0].text, text);
+    }
+    
+    #[test]
+    fn split_keeps_out_of_order_markers_as_text() {
+        let pages = split_legacy_pages("--- Page 2 ---\nquoted:\n--- Page 1 ---\n\n--- Page 3 ---\nend\n\n");
+        
+        assert_eq!(page_nums(&pages), vec![2, 3]);
+        assert_eq!(pages[0].text, "quoted:\n--- Page 1 ---");
+    }
+    
+    #[test]
+    fn split_empty_text() {
+        assert!(split_legacy_pages("").is_empty());
+    }
+    
+    #[tokio::test]
+    async fn migrated_database_reproduces_legacy_text() -> Result<()> {
+        let marked = "--- Page 1 ---\nIntroduction\n\n--- Page 2 ---\nMethods and results\n\n";
+        let ocr = "--- Page 1 (OCR) ---\nScanned letter\n\n\n--- Page 4 (OCR) ---\nSignature\n\n";
+        let unmarked = "Text recovered by pdf-extract";
+        
+        let db = Database::new(Path::new(":memory:")).await?;
+        {
+            let conn = db.conn.lock().await;
+            conn.execute_batch(
+                r#"
+                CREATE TABLE pdf_extractions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    file_path TEXT NOT NULL,
+                    file_hash TEXT,
+                    file_size INTEGER,
+                    extraction_method TEXT NOT NULL,
+                    extracted_text TEXT,
+                    page_count INTEGER,
+                    processing_time_seconds REAL,
+                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    success BOOLEAN NOT NULL,
+                    error_message TEXT,
+                    UNIQUE(file_path, file_hash)
+                );
+                CREATE INDEX idx_file_path ON pdf_extractions(file_path);
+                "#,
+            )?;
+            
+            let mut insert = conn.prepare(
+                "INSERT INTO pdf_extractions (file_path, file_hash, file_size, extraction_method, extracted_text, success)
+                 VALUES (?1, 'abc123', 100, ?2, ?3, ?4)",
+            )?;
+            insert.execute(params!["a.pdf", "direct", marked, true])?;
+            insert.execute(params!["b.pdf", "ocr", ocr, true])?;
+            insert.execute(params!["c.pdf", "direct", unmarked, true])?;
+            insert.execute(params!["d.pdf", "error", "", false])?;
+        }
+        
+        db.init_schema().await?;
+        // A second run finds nothing left to migrate
+        db.init_schema().await?;
+        
+        let conn = db.conn.lock().await;
+        let text_of = |path: &str| -> Result<Option<String>> {
+            let (id, method): (i64, String) = conn.query_row(
+                "SELECT id, extraction_method FROM pdf_extractions WHERE file_path = ?1",
+                params![path],
+                |row| Ok((row.get(0)?, row.get(1)?)),
+            )?;
+            document_text(&conn, id, &method)
+        };
+        
+        assert_eq!(text_of("a.pdf")?.as_deref(), Some(marked));
+        assert_eq!(text_of("b.pdf")?.as_deref(), Some(ocr));
+        assert_eq!(
+            text_of("c.pdf")?.as_deref(),
+            Some("--- Page 1 ---\nText recovered by pdf-extract\n\n")
+        );
+        assert_eq!(text_of("d.pdf")?, None);
+        
+        let legacy_columns: i64 = conn.query_row(
+            "SELECT COUNT(*) FROM pragma_table_info('pdf_extractions') WHERE name = 'extracted_text'",
+            [],
+            |row| row.get(0),
+        )?;
+        assert_eq!(legacy_columns, 0);
+        
+        let text_length: i64 = conn.query_row(
+            "SELECT text_length FROM pdf_extractions WHERE file_path = 'a.pdf'",
+            [],
+            |row| row.get(0),
+        )?;
+        assert_eq!(text_length, ("Introduction".len() + "Methods and results".len()) as i64);
+        drop(conn);
+        
+        let hits = db.search_text("scanned letter", 10).await?;
+        assert_eq!(hits.len(), 1);
+        assert_eq!((hits[0].file_path.as_str(), hits[0].page_num), ("b.pdf", 1));
+        
+        Ok(())
+    }
+}
@@ -2,16 +2,40 @@ use anyhow::{Result, Context};
 use std::path::{Path, PathBuf};
 use std::sync::Arc;
 use std::time::Instant;
-use tokio::sync::Semaphore;
+use tokio::sync::{mpsc, Semaphore};
+use tokio::task::{JoinError, JoinSet};
 use log::{info, warn, error};
 use walkdir::WalkDir;
 
 use crate::cli::Args;
-use crate::database::{Database, ExtractionResult};
+use crate::database::{Database, ExtractionResult, PageText, ResultWriter};
 use crate::pdf::PdfProcessor;
 use crate::ocr::OcrProcessor;
 use crate::progress::ProgressTracker;
 
+/// Paths buffered between the directory walk and the preparation stage
+const WALK_QUEUE: usize = 256;
+
+/// Files hashed concurrently ahead of extraction
+const HASH_WORKERS: usize = 4;
+
+/// Outcome counts for a processing run
+#[derive(Debug, Default)]
+pub struct ProcessingSummary {
+    pub discovered: usize,
+    pub processed: usize,
+    pub successful: usize,
+    pub skipped: usize,
+}
+
+/// A discovered PDF with the metadata and hash extraction needs
+struct PreparedFile {
+    path: PathBuf,
+    file_size: i64,
+    file_mtime: f64,
+    file_hash: String,
+}
+
 pub struct PdfExtractor {
     args: Args,
     pdf_processor: PdfProcessor,
@@ -22,103 +46,194 @@ impl PdfExtractor {
     pub fn new(args: Args) -> Self {
         Self {
             pdf_processor: PdfProcessor::new(),
-            ocr_processor: OcrProcessor::new(args.text_only, args.use_gpu),
+            ocr_processor: OcrProcessor::new(args.text_only, args.use_gpu, args.threads),
             args,
         }
     }
     
-    /// Find all PDF files in directory tree
-    pub async fn find_pdf_files(&self, dir: &Path) -> Result<Vec<PathBuf>> {
-        let mut pdf_files = Vec::new();
+    /// Discover, hash and extract every PDF under `dir`.
+    ///
+    /// Runs as a pipeline: a blocking walker feeds paths to a preparation
+    /// stage that skips unchanged files and hashes the rest, which fills a
+    /// bounded queue drained by the extraction workers. Hashing upcoming
+    /// files overlaps with extraction of the current ones.
+    pub async fn process_dir(
+        &self, 
+        dir: &Path, 
+        db: &Database,
+        writer: &ResultWriter
+    ) -> Result<ProcessingSummary> {
+        // Check OCR availability
+        if !self.ocr_processor.check_ocr_availability().await && !self.args.text_only {
+            warn!("OCR tools not available - falling back to text-only mode");
+        }
         
-        for entry in WalkDir::new(dir) {
-            let entry = entry?;
-            let path = entry.path();
-            
-            if path.is_file() && 
-               path.extension().and_then(|s| s.to_str()) == Some("pdf") {
-                pdf_files.push(path.to_path_buf());
-            }
+        let (path_tx, path_rx) = mpsc::channel(WALK_QUEUE);
+        let (ready_tx, ready_rx) = mpsc::channel(std::cmp::max(1, 2 * self.args.threads));
+        let progress = ProgressTracker::new(0);
+        
+        let walk_dir = dir.to_path_buf();
+        let walker = tokio::task::spawn_blocking(move || find_pdf_files(&walk_dir, path_tx));
+        
+        let (prepared, extracted) = tokio::join!(
+            self.prepare_files(path_rx, ready_tx, db, &progress),
+            self.extract_files(ready_rx, writer, &progress),
+        );
+        
+        let discovered = walker.await.context("Directory walk panicked")??;
+        let skipped = prepared?;
+        let mut summary = extracted?;
+        summary.discovered = discovered;
+        summary.skipped = skipped;
+        
+        if skipped > 0 {
+            info!("Skipped {} unchanged files already in the database", skipped);
         }
         
-        pdf_files.sort();
-        Ok(pdf_files)
+        progress.finish();
+        Ok(summary)
     }
     
-    /// Process multiple PDF files concurrently
-    pub async fn process_files(
-        &self, 
-        pdf_files: Vec<PathBuf>, 
-        db: &Database
-    ) -> Result<Vec<ExtractionResult>> {
-        // Check OCR availability
-        if !self.ocr_processor.check_ocr_availability().await && !self.args.text_only {
-            warn!("OCR tools not available - falling back to text-only mode");
+    /// Skip unchanged files and hash the rest, `HASH_WORKERS` at a time.
+    ///
+    /// Only metadata is read for unchanged files, so they are never hashed.
+    /// Returns the number of files skipped.
+    async fn prepare_files(
+        &self,
+        mut paths: mpsc::Receiver<PathBuf>,
+        ready: mpsc::Sender<PreparedFile>,
+        db: &Database,
+        progress: &ProgressTracker,
+    ) -> Result<usize> {
+        let mut hashing = JoinSet::new();
+        let mut skipped = 0;
+        
+        while let Some(pdf_path) = paths.recv().await {
+            let metadata = match tokio::fs::metadata(&pdf_path).await {
+                Ok(metadata) => metadata,
+                Err(e) => {
+                    warn!("Cannot read metadata for {}: {}", pdf_path.display(), e);
+                    continue;
+                }
+            };
+            let file_size = metadata.len() as i64;
+            let file_mtime = file_mtime(&metadata);
+            
+            if !self.args.force
+                && db
+                    .is_unchanged(&pdf_path.to_string_lossy(), file_size, file_mtime, self.args.ocr_only)
+                    .await?
+            {
+                skipped += 1;
+                continue;
+            }
+            
+            if hashing.len() >= HASH_WORKERS {
+                if let Some(hashed) = hashing.join_next().await {
+                    if !forward_prepared(hashed, &ready, progress).await {
+                        return Ok(skipped);
+                    }
+                }
+            }
+            
+            let full_hash = self.args.full_hash;
+            hashing.spawn_blocking(move || {
+                let hash = if full_hash {
+                    full_digest(&pdf_path)
+                } else {
+                    sampled_digest(&pdf_path)
+                };
+                
+                match hash {
+                    Ok(file_hash) => Ok(PreparedFile { path: pdf_path, file_size, file_mtime, file_hash }),
+                    Err(e) => Err(e.context(format!("Failed to hash {}", pdf_path.display()))),
+                }
+            });
+        }
+        
+        while let Some(hashed) = hashing.join_next().await {
+            if !forward_prepared(hashed, &ready, progress).await {
+                break;
+            }
         }
         
+        Ok(skipped)
+    }
+    
+    /// Extract queued files with up to `--threads` running at once
+    async fn extract_files(
+        &self,
+        mut ready: mpsc::Receiver<PreparedFile>,
+        writer: &ResultWriter,
+        progress: &ProgressTracker,
+    ) -> Result<ProcessingSummary> {
         let semaphore = Arc::new(Semaphore::new(self.args.threads));
-        let progress = ProgressTracker::new(pdf_files.len());
+        let mut tasks = JoinSet::new();
+        let mut index = 0;
         
-        let tasks: Vec<_> = pdf_files
-            .into_iter()
-            .enumerate()
-            .map(|(index, pdf_path)| {
-                let semaphore = semaphore.clone();
-                let progress = progress.clone();
-                let extractor = self.clone_for_task();
+        while let Some(file) = ready.recv().await {
+            // Waiting for a free worker here applies backpressure to hashing
+            let permit = semaphore.clone().acquire_owned().await?;
+            index += 1;
+            
+            let file_index = index;
+            let progress = progress.clone();
+            let sender = writer.sender();
+            let extractor = self.clone_for_task();
+            
+            tasks.spawn(async move {
+                let _permit = permit;
+                let result = extractor.process_single_file(&file, file_index).await;
+                progress.increment();
                 
-                tokio::spawn(async move {
-                    let _permit = semaphore.acquire().await.unwrap();
-                    let result = extractor.process_single_file(&pdf_path, index + 1).await;
-                    progress.increment();
-                    result
+                // Hand the result to the writer thread and keep only the outcome
+                result.map(|result| {
+                    let success = result.success;
+                    if sender.send(result).is_err() {
+                        error!("Database writer stopped; dropping result for {}", file.path.display());
+                    }
+                    success
                 })
-            })
-            .collect();
+            });
+        }
         
-        // Wait for all tasks and collect results
-        let mut results = Vec::new();
-        for task in tasks {
-            match task.await? {
-                Ok(result) => results.push(result),
+        // Wait for all tasks and tally outcomes
+        let mut summary = ProcessingSummary::default();
+        while let Some(task) = tasks.join_next().await {
+            match task {
+                Ok(Ok(success)) => {
+                    summary.processed += 1;
+                    if success {
+                        summary.successful += 1;
+                    }
+                }
+                Ok(Err(e)) => error!("Task failed: {}", e),
                 Err(e) => error!("Task failed: {}", e),
             }
         }
         
-        // Batch insert into database
-        if !results.is_empty() {
-            info!("Inserting {} results into database", results.len());
-            db.batch_insert(&results).await?;
-        }
-        
-        progress.finish();
-        Ok(results)
+        Ok(summary)
     }
     
     /// Process a single PDF file
-    async fn process_single_file(&self, pdf_path: &Path, file_index: usize) -> Result<ExtractionResult> {
+    async fn process_single_file(&self, file: &PreparedFile, file_index: usize) -> Result<ExtractionResult> {
+        let pdf_path = file.path.as_path();
         let start_time = Instant::now();
         let relative_path = pdf_path.to_string_lossy().to_string();
         
         info!("Processing ({}): {}", file_index, relative_path);
         
-        // Get file metadata
-        let metadata = tokio::fs::metadata(pdf_path).await?;
-        let file_size = metadata.len() as i64;
-        let file_hash = self.calculate_file_hash(pdf_path).await?;
-        
-        // Check if already processed (unless force flag is set)
-        if !self.args.force {
-            // This would require database access - simplified for now
-        }
+        let file_size = file.file_size;
+        let file_mtime = file.file_mtime;
+        let file_hash = file.file_hash.clone();
         
         // Choose extraction method based on flags
-        let (text, page_count, method) = if self.args.ocr_only {
+        let (pages, page_count, method) = if self.args.ocr_only {
             // Skip direct extraction, use OCR only
             match self.ocr_processor.extract_text_ocr(pdf_path).await {
-                Ok((ocr_text, ocr_page_count)) => {
+                Ok((ocr_pages, ocr_page_count)) => {
                     info!("Used OCR only for {}", relative_path);
-                    (ocr_text, ocr_page_count, "ocr".to_string())
+                    (ocr_pages, ocr_page_count, "ocr".to_string())
                 }
                 Err(e) => {
                     error!("OCR extraction failed for {}: {}", relative_path, e);
@@ -127,8 +242,9 @@ impl PdfExtractor {
                         file_path: relative_path,
                         file_hash: Some(file_hash),
                         file_size,
+                        file_mtime,
                         extraction_method: "error".to_string(),
-                        extracted_text: String::new(),
+                        pages: Vec::new(),
                         page_count: 0,
                         processing_time_seconds: start_time.elapsed().as_secs_f64(),
                         timestamp: chrono::Utc::now(),
@@ -139,21 +255,21 @@ impl PdfExtractor {
             }
         } else {
             // Try direct text extraction first (default behavior)
-            match self.pdf_processor.extract_text_direct(pdf_path) {
-                Ok((text, page_count)) => {
-                    if self.pdf_processor.has_extractable_text(&text) {
+            match self.extract_direct(pdf_path).await {
+                Ok((pages, page_count)) => {
+                    if self.pdf_processor.has_extractable_text(&pages) {
                         info!("Extracted text directly from {}", relative_path);
-                        (text, page_count, "direct".to_string())
+                        (pages, page_count, "direct".to_string())
                     } else {
                         // Fall back to OCR
                         match self.ocr_processor.extract_text_ocr(pdf_path).await {
-                            Ok((ocr_text, ocr_page_count)) => {
+                            Ok((ocr_pages, ocr_page_count)) => {
                                 info!("Used OCR for {}", relative_path);
-                                (ocr_text, ocr_page_count, "ocr".to_string())
+                                (ocr_pages, ocr_page_count, "ocr".to_string())
                             }
                             Err(e) => {
                                 warn!("OCR failed for {}: {}", relative_path, e);
-                                (text, page_count, "direct_partial".to_string())
+                                (pages, page_count, "direct_partial".to_string())
                             }
                         }
                     }
@@ -161,9 +277,9 @@ impl PdfExtractor {
                 Err(e) => {
                     // Try OCR as last resort
                     match self.ocr_processor.extract_text_ocr(pdf_path).await {
-                        Ok((ocr_text, ocr_page_count)) => {
+                        Ok((ocr_pages, ocr_page_count)) => {
                             info!("Used OCR after direct extraction failed for {}", relative_path);
-                            (ocr_text, ocr_page_count, "ocr".to_string())
+                            (ocr_pages, ocr_page_count, "ocr".to_string())
                         }
                         Err(ocr_e) => {
                             error!("Both direct and OCR extraction failed for {}: direct={}, ocr={}", 
@@ -173,8 +289,9 @@ impl PdfExtractor {
                                 file_path: relative_path,
                                 file_hash: Some(file_hash),
                                 file_size,
+                                file_mtime,
                                 extraction_method: "error".to_string(),
-                                extracted_text: String::new(),
+                                pages: Vec::new(),
                                 page_count: 0,
                                 processing_time_seconds: start_time.elapsed().as_secs_f64(),
                                 timestamp: chrono::Utc::now(),
@@ -194,8 +311,9 @@ impl PdfExtractor {
             file_path: relative_path,
             file_hash: Some(file_hash),
             file_size,
+            file_mtime,
             extraction_method: method,
-            extracted_text: text,
+            pages,
             page_count: page_count as i32,
             processing_time_seconds: processing_time,
             timestamp: chrono::Utc::now(),
@@ -204,62 +322,145 @@ impl PdfExtractor {
         })
     }
     
-    /// Calculate file hash (fast or full based on settings)
-    async fn calculate_file_hash(&self, file_path: &Path) -> Result<String> {
-        if self.args.full_hash {
-            self.calculate_full_hash(file_path).await
-        } else {
-            self.calculate_fast_hash(file_path).await
+    /// Run direct extraction on the blocking pool.
+    ///
+    /// lopdf parsing is CPU-bound; running it inline would stall the async
+    /// runtime threads that drive OCR subprocesses and hashing.
+    async fn extract_direct(&self, pdf_path: &Path) -> Result<(Vec<PageText>, usize)> {
+        let pdf_path = pdf_path.to_path_buf();
+        
+        tokio::task::spawn_blocking(move || PdfProcessor::new().extract_text_direct(&pdf_path))
+            .await
+            .context("Direct extraction task panicked")?
+    }
+    
+    /// Create a clone suitable for async tasks
+    fn clone_for_task(&self) -> Self {
+        Self {
+            args: self.args.clone(),
+            pdf_processor: PdfProcessor::new(),
+            ocr_processor: OcrProcessor::new(self.args.text_only, self.args.use_gpu, self.args.threads),
         }
     }
+}
+
+/// Modification time in seconds since the Unix epoch, 0.0 if unavailable
+fn file_mtime(metadata: &std::fs::Metadata) -> f64 {
+    metadata
+        .modified()
+        .ok()
+        .and_then(|modified| modified.duration_since(std::time::UNIX_EPOCH).ok())
+        .map(|duration| duration.as_secs_f64())
+        .unwrap_or(0.0)
+}
+
+/// Fast digest of metadata plus the first and last 1KB, tagged with its algorithm
+fn sampled_digest(file_path: &Path) -> Result<String> {
+    use std::io::{Read, Seek, SeekFrom};
     
-    /// Calculate fast hash (metadata + first/last chunks)
-    async fn calculate_fast_hash(&self, file_path: &Path) -> Result<String> {
-        use sha2::{Sha256, Digest};
-        
-        let metadata = tokio::fs::metadata(file_path).await?;
-        let mut hasher = Sha256::new();
-        
-        // Hash metadata
-        hasher.update(metadata.len().to_be_bytes());
-        if let Ok(modified) = metadata.modified() {
-            if let Ok(duration) = modified.duration_since(std::time::UNIX_EPOCH) {
-                hasher.update(duration.as_secs().to_be_bytes());
+    let mut file = std::fs::File::open(file_path)?;
+    let metadata = file.metadata()?;
+    let file_len = metadata.len();
+    let mut hasher = blake3::Hasher::new();
+    
+    // Hash metadata
+    hasher.update(&file_len.to_be_bytes());
+    if let Ok(modified) = metadata.modified() {
+        if let Ok(duration) = modified.duration_since(std::time::UNIX_EPOCH) {
+            hasher.update(&duration.as_secs().to_be_bytes());
+        }
+    }
+    
+    // Hash first and last 1KB without reading the rest of the file
+    let mut chunk = [0u8; 1024];
+    let head_len = file_len.min(1024) as usize;
+    file.read_exact(&mut chunk[..head_len])?;
+    hasher.update(&chunk[..head_len]);
+    
+    if file_len > 1024 {
+        let tail_start = std::cmp::max(1024, file_len - 1024);
+        let tail_len = (file_len - tail_start) as usize;
+        file.seek(SeekFrom::Start(tail_start))?;
+        file.read_exact(&mut chunk[..tail_len])?;
+        hasher.update(&chunk[..tail_len]);
+    }
+    
+    Ok(format!("blake3-sampled:{}", hasher.finalize().to_hex()))
+}
+
+/// Digest of the whole file, memory-mapped and hashed across cores
+fn full_digest(file_path: &Path) -> Result<String> {
+    let mut hasher = blake3::Hasher::new();
+    hasher.update_mmap_rayon(file_path)?;
+    
+    Ok(format!("blake3:{}", hasher.finalize().to_hex()))
+}
+
+/// Walk `dir` and send each PDF path as it is found, returning the count.
+///
+/// Unreadable entries are logged and skipped so one bad directory does not
+/// end the run after everything else has been extracted.
+fn find_pdf_files(dir: &Path, sender: mpsc::Sender<PathBuf>) -> Result<usize> {
+    let mut found = 0;
+    
+    for entry in WalkDir::new(dir).sort_by_file_name() {
+        let entry = match entry {
+            Ok(entry) => entry,
+            // Only a missing or unreadable input directory is fatal
+            Err(e) if e.depth() == 0 => return Err(e.into()),
+            Err(e) => {
+                warn!("Skipping unreadable path: {}", e);
+                continue;
             }
+        };
+        
+        if !is_pdf_name(entry.file_name()) {
+            continue;
         }
         
-        // Hash first and last 1KB
-        let file_content = tokio::fs::read(file_path).await?;
-        let file_len = file_content.len();
+        // file_type() comes from the directory entry; only symlinks need a stat
+        let is_file = if entry.path_is_symlink() {
+            entry.path().is_file()
+        } else {
+            entry.file_type().is_file()
+        };
         
-        if file_len > 0 {
-            let first_chunk_end = std::cmp::min(1024, file_len);
-            hasher.update(&file_content[0..first_chunk_end]);
-            
-            if file_len > 1024 {
-                let last_chunk_start = std::cmp::max(1024, file_len - 1024);
-                hasher.update(&file_content[last_chunk_start..]);
+        if is_file {
+            found += 1;
+            // The receiver only goes away when the pipeline is shutting down
+            if sender.blocking_send(entry.into_path()).is_err() {
+                break;
             }
         }
-        
-        Ok(format!("{:x}", hasher.finalize()))
-    }
-    
-    /// Calculate full file hash
-    async fn calculate_full_hash(&self, file_path: &Path) -> Result<String> {
-        use sha2::{Sha256, Digest};
-        
-        let content = tokio::fs::read(file_path).await?;
-        let hash = Sha256::digest(&content);
-        Ok(format!("{:x}", hash))
     }
     
-    /// Create a clone suitable for async tasks
-    fn clone_for_task(&self) -> Self {
-        Self {
-            args: self.args.clone(),
-            pdf_processor: PdfProcessor::new(),
-            ocr_processor: OcrProcessor::new(self.args.text_only, self.args.use_gpu),
+    Ok(found)
+}
+
+/// Queue a hashed file for extraction; false once extraction has stopped
+async fn forward_prepared(
+    hashed: std::result::Result<Result<PreparedFile>, JoinError>,
+    ready: &mpsc::Sender<PreparedFile>,
+    progress: &ProgressTracker,
+) -> bool {
+    match hashed {
+        Ok(Ok(file)) => {
+            progress.inc_length(1);
+            ready.send(file).await.is_ok()
+        }
+        Ok(Err(e)) => {
+            warn!("{:#}", e);
+            true
+        }
+        Err(e) => {
+            error!("Hashing task failed: {}", e);
+            true
         }
     }
+}
+
+/// Case-insensitive `.pdf` suffix check without allocating
+fn is_pdf_name(name: &std::ffi::OsStr) -> bool {
+    let name = name.as_encoded_bytes();
+    name.len() > 4 && name[name.len() - 4..].eq_ignore_ascii_case(b".pdf")
 }
\ No newline at end of file
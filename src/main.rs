@@ -1,6 +1,7 @@
 use anyhow::Result;
 use clap::Parser;
 use std::path::PathBuf;
+use std::time::Duration;
 use log::{info, warn, error};
 
 mod cli;
@@ -11,16 +12,53 @@ mod ocr;
 mod progress;
 
 use cli::Args;
-use database::Database;
+use database::{Database, ResultWriter};
 use extractor::PdfExtractor;
 
-#[tokio::main]
-async fn main() -> Result<()> {
+/// Rows per write transaction in the background writer
+const WRITER_BATCH_SIZE: usize = 32;
+
+/// Longest a partial batch may wait before it is committed
+const WRITER_FLUSH_INTERVAL: Duration = Duration::from_secs(1);
+
+fn main() -> Result<()> {
     // Initialize logging
     env_logger::init();
-
+    
     let args = Args::parse();
     
+    // libgomp reads these when it is loaded, before main, so a linked
+    // libtesseract keeps whatever the launching environment set
+    #[cfg(feature = "leptess")]
+    if !args.text_only && std::env::var_os("OMP_THREAD_LIMIT").is_none() {
+        warn!("OMP_THREAD_LIMIT is unset; in-process Tesseract may use several threads per page. \
+               Export OMP_THREAD_LIMIT=1 before starting for best batch throughput");
+    }
+    
+    // Parallelism comes from our own workers; a multi-threaded tesseract per
+    // worker would oversubscribe the cores. This trades single-page latency
+    // for batch throughput. Child tesseract processes inherit these. They are
+    // set before the runtime starts so no other thread is reading the
+    // environment.
+    for var in ["OMP_THREAD_LIMIT", "OMP_NUM_THREADS"] {
+        if std::env::var_os(var).is_none() {
+            std::env::set_var(var, "1");
+        }
+    }
+    
+    tokio::runtime::Builder::new_multi_thread()
+        .enable_all()
+        .build()?
+        .block_on(run(args))
+}
+
+async fn run(mut args: Args) -> Result<()> {
+    let cores = std::thread::available_parallelism().map(|n| n.get()).unwrap_or(1);
+    if args.threads == 0 || args.threads > cores {
+        warn!("Clamping --threads {} to the {} available cores", args.threads, cores);
+        args.threads = args.threads.clamp(1, cores);
+    }
+    
     info!("🦀 PDF OCR Extractor (Rust Edition) starting...");
     info!("Threads: {}", args.threads);
     info!("Database: {}", args.database.display());
@@ -32,29 +70,38 @@ async fn main() -> Result<()> {
     // Create extractor
     let extractor = PdfExtractor::new(args.clone());
     
-    // Find PDF files
-    let pdf_files = extractor.find_pdf_files(&args.input_dir).await?;
+    // Results are committed in batches by a dedicated writer thread
+    let writer = ResultWriter::spawn(&args.database, WRITER_BATCH_SIZE, WRITER_FLUSH_INTERVAL)?;
+    
+    // Discover, hash and extract PDFs as one pipeline
+    // Flush results already handed to the writer even if the run failed
+    let summary = extractor.process_dir(&args.input_dir, &db, &writer).await;
+    let written = writer.finish()?;
+    let summary = summary?;
     
-    if pdf_files.is_empty() {
+    if summary.discovered == 0 {
         warn!("No PDF files found in {}", args.input_dir.display());
         return Ok(());
     }
     
-    info!("Found {} PDF files", pdf_files.len());
-    
-    // Process files
-    let results = extractor.process_files(pdf_files, &db).await?;
+    info!("Found {} PDF files", summary.discovered);
     
     // Print summary
-    let successful = results.iter().filter(|r| r.success).count();
-    let failed = results.len() - successful;
+    let failed = summary.processed - summary.successful;
     
     println!("\n🎉 Extraction complete!");
-    println!("Processed: {}/{} PDFs", results.len(), results.len());
-    println!("Successful: {}", successful);
+    println!("Processed: {}/{} PDFs", summary.processed, summary.discovered - summary.skipped);
+    println!("Successful: {}", summary.successful);
     println!("Failed: {}", failed);
+    println!("Skipped (unchanged): {}", summary.skipped);
     println!("Database: {}", args.database.display());
     
+    // The writer logs failed batches and carries on; surface the loss here
+    if written < summary.processed {
+        error!("Only {} of {} results were written to the database", written, summary.processed);
+        anyhow::bail!("{} results were not saved", summary.processed - written);
+    }
+    
     // Export if requested
     if let Some(export_path) = args.export_txt {
         db.export_to_text(&export_path).await?;
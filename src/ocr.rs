@@ -1,48 +1,178 @@
 use anyhow::{Result, Context};
-use std::path::Path;
+use std::path::{Path, PathBuf};
+use std::sync::Arc;
+use tokio::sync::Semaphore;
+use tokio::task::JoinSet;
 use log::{info, warn, error};
 
+use crate::database::PageText;
+
+#[cfg(feature = "leptess")]
+thread_local! {
+    /// Tesseract instance owned by each OCR pool thread, reused across pages
+    static TESSERACT: std::cell::RefCell<Option<leptess::LepTess>> = std::cell::RefCell::new(None);
+}
+
+/// Threads that run in-process OCR. Unlike the shared blocking pool these
+/// never exit while idle, so each keeps its loaded model for the whole run.
+#[cfg(feature = "leptess")]
+static OCR_POOL: std::sync::OnceLock<rayon::ThreadPool> = std::sync::OnceLock::new();
+
+/// Resolution used when rasterizing pages for OCR; ample for body text
+const RENDER_DPI: &str = "110";
+
+/// Pages rendered and passed to a single tesseract invocation
+const OCR_BATCH_PAGES: usize = 16;
+
+#[derive(Clone)]
 pub struct OcrProcessor {
     text_only: bool,
     use_gpu: bool,
+    page_workers: usize,
+    /// Page batches that may run at once across all files
+    #[cfg(feature = "leptess")]
+    ocr_threads: usize,
 }
 
 impl OcrProcessor {
-    pub fn new(text_only: bool, use_gpu: bool) -> Self {
-        Self { text_only, use_gpu }
+    /// `file_workers` is the number of PDFs processed concurrently; each
+    /// document gets an equal share of the remaining cores for page batches
+    pub fn new(text_only: bool, use_gpu: bool, file_workers: usize) -> Self {
+        let cores = std::thread::available_parallelism().map(|n| n.get()).unwrap_or(1);
+        let page_workers = std::cmp::max(1, cores / std::cmp::max(1, file_workers));
+        
+        Self {
+            text_only,
+            use_gpu,
+            page_workers,
+            #[cfg(feature = "leptess")]
+            ocr_threads: page_workers * std::cmp::max(1, file_workers),
+        }
     }
     
     /// Perform OCR on PDF file
-    pub async fn extract_text_ocr(&self, pdf_path: &Path) -> Result<(String, usize)> {
+    pub async fn extract_text_ocr(&self, pdf_path: &Path) -> Result<(Vec<PageText>, usize)> {
         if self.text_only {
             return Err(anyhow::anyhow!("OCR disabled (text-only mode)"));
         }
         
         info!("Starting OCR for {}", pdf_path.display());
         
-        // For now, we'll use a simplified approach since tesseract-rs binding can be complex
-        // In a real implementation, you'd:
-        // 1. Convert PDF pages to images using pdf2image equivalent
-        // 2. Run Tesseract OCR on each image
-        // 3. Combine results
-        
-        // Placeholder implementation - would need proper PDF to image conversion
-        // and Tesseract integration
-        
         self.extract_with_system_tesseract(pdf_path).await
     }
     
     /// Use system tesseract command as fallback
-    async fn extract_with_system_tesseract(&self, pdf_path: &Path) -> Result<(String, usize)> {
-        use tokio::process::Command;
+    ///
+    /// Pages are rendered and OCR'd in batches of `OCR_BATCH_PAGES`, so temp
+    /// usage stays bounded while each tesseract run covers many pages. Up to
+    /// `page_workers` batches of the same document run at once.
+    async fn extract_with_system_tesseract(&self, pdf_path: &Path) -> Result<(Vec<PageText>, usize)> {
+        // The page range comes from poppler, which also renders the pages;
+        // lopdf's page tree walk can undercount and silently drop pages
+        let page_count = self.get_page_count(pdf_path).await?;
+        
+        if page_count == 0 {
+            return Err(anyhow::anyhow!("PDF has no pages"));
+        }
         
-        // First convert PDF to images using pdftoppm
         let temp_dir = tempfile::tempdir()?;
-        let image_prefix = temp_dir.path().join("page");
+        let semaphore = Arc::new(Semaphore::new(self.page_workers));
+        let mut batches = JoinSet::new();
+        
+        for (batch_index, first_page) in (1..=page_count).step_by(OCR_BATCH_PAGES).enumerate() {
+            let last_page = std::cmp::min(first_page + OCR_BATCH_PAGES - 1, page_count);
+            let permit = semaphore.clone().acquire_owned().await?;
+            let processor = self.clone();
+            let pdf_path = pdf_path.to_path_buf();
+            let batch_dir = temp_dir.path().join(format!("batch-{}", batch_index));
+            
+            batches.spawn(async move {
+                let _permit = permit;
+                processor.ocr_page_range(&pdf_path, first_page, last_page, &batch_dir).await
+            });
+        }
+        
+        let batch_count = batches.len();
+        let mut pages = Vec::new();
+        let mut last_error = None;
+        let mut failed = 0;
+        while let Some(batch) = batches.join_next().await {
+            match batch.context("OCR batch panicked")? {
+                Ok(batch_pages) => pages.extend(batch_pages),
+                Err(e) => {
+                    warn!("{:#}", e);
+                    failed += 1;
+                    last_error = Some(e);
+                }
+            }
+        }
+        
+        // A document where no batch could be rendered or read is a failure,
+        // not an empty result
+        if failed == batch_count {
+            if let Some(e) = last_error {
+                return Err(e);
+            }
+        }
+        
+        // Batches finish out of order
+        pages.sort_by_key(|page| page.page_num);
+        Ok((pages, page_count))
+    }
+    
+    /// Render and OCR one batch of pages in its own directory
+    async fn ocr_page_range(
+        &self,
+        pdf_path: &Path,
+        first_page: usize,
+        last_page: usize,
+        batch_dir: &Path,
+    ) -> Result<Vec<PageText>> {
+        tokio::fs::create_dir_all(batch_dir)
+            .await
+            .context("Could not create OCR work directory")?;
+        
+        let result = match self.render_pages(pdf_path, first_page, last_page, batch_dir).await {
+            Ok(images) => self
+                .ocr_images(&images, batch_dir)
+                .await
+                .map(|texts| {
+                    images
+                        .iter()
+                        .zip(texts)
+                        .filter(|(_, text)| !text.trim().is_empty())
+                        .map(|((page_num, _), text)| PageText { page_num: *page_num, text })
+                        .collect()
+                })
+                .with_context(|| format!("OCR failed for pages {}-{}", first_page, last_page)),
+            Err(e) => Err(e.context(format!("Rendering failed for pages {}-{}", first_page, last_page))),
+        };
+        
+        // Free this batch's images as soon as it is done
+        let _ = tokio::fs::remove_dir_all(batch_dir).await;
+        result
+    }
+    
+    /// Render a range of pages with pdftoppm, returning (page number, image) pairs
+    async fn render_pages(
+        &self,
+        pdf_path: &Path,
+        first_page: usize,
+        last_page: usize,
+        out_dir: &Path,
+    ) -> Result<Vec<(usize, PathBuf)>> {
+        use tokio::process::Command;
+        
+        let image_prefix = out_dir.join("page");
+        let first = first_page.to_string();
+        let last = last_page.to_string();
         
         let output = Command::new("pdftoppm")
             .args([
-                "-png",
+                "-gray",  // 8-bit PGM: one byte per pixel, no PNG encode/decode
+                "-r", RENDER_DPI,
+                "-f", first.as_str(),
+                "-l", last.as_str(),
                 pdf_path.to_str().unwrap(),
                 image_prefix.to_str().unwrap(),
             ])
@@ -57,52 +187,114 @@ impl OcrProcessor {
             ));
         }
         
-        // Find generated image files
-        let mut image_files = Vec::new();
-        let mut entries = tokio::fs::read_dir(temp_dir.path()).await?;
+        // pdftoppm names images page-<N>.pgm with N zero-padded
+        let mut images = Vec::new();
+        let mut entries = tokio::fs::read_dir(out_dir).await?;
         
         while let Some(entry) = entries.next_entry().await? {
             let path = entry.path();
-            if path.extension().and_then(|s| s.to_str()) == Some("png") {
-                image_files.push(path);
+            if path.extension().and_then(|s| s.to_str()) != Some("pgm") {
+                continue;
+            }
+            
+            let page_num = path
+                .file_stem()
+                .and_then(|s| s.to_str())
+                .and_then(|stem| stem.rsplit('-').next())
+                .and_then(|num| num.parse::<usize>().ok());
+            
+            if let Some(page_num) = page_num {
+                images.push((page_num, path));
             }
         }
         
-        image_files.sort();
-        let page_count = image_files.len();
-        
-        if image_files.is_empty() {
+        if images.is_empty() {
             return Err(anyhow::anyhow!("No images generated from PDF"));
         }
         
-        // Run OCR on each image
-        let mut full_text = String::new();
+        images.sort();
+        Ok(images)
+    }
+    
+    /// Read the page count with pdfinfo without rendering anything
+    async fn get_page_count(&self, pdf_path: &Path) -> Result<usize> {
+        use tokio::process::Command;
         
-        for (page_num, image_path) in image_files.iter().enumerate() {
-            match self.ocr_image(image_path).await {
-                Ok(text) => {
-                    if !text.trim().is_empty() {
-                        full_text.push_str(&format!("--- Page {} (OCR) ---\n", page_num + 1));
-                        full_text.push_str(&text);
-                        full_text.push_str("\n\n");
-                    }
-                }
-                Err(e) => {
-                    warn!("OCR failed for page {}: {}", page_num + 1, e);
-                }
-            }
+        let output = Command::new("pdfinfo")
+            .arg(pdf_path)
+            .output()
+            .await
+            .context("Failed to run pdfinfo")?;
+        
+        if !output.status.success() {
+            return Err(anyhow::anyhow!(
+                "pdfinfo failed: {}",
+                String::from_utf8_lossy(&output.stderr)
+            ));
         }
         
-        Ok((full_text, page_count))
+        String::from_utf8_lossy(&output.stdout)
+            .lines()
+            .find_map(|line| line.strip_prefix("Pages:"))
+            .and_then(|count| count.trim().parse().ok())
+            .ok_or_else(|| anyhow::anyhow!("pdfinfo did not report a page count"))
     }
     
-    /// OCR a single image file
-    async fn ocr_image(&self, image_path: &Path) -> Result<String> {
+    /// OCR a batch of page images, returning one text per image in order
+    async fn ocr_images(&self, images: &[(usize, PathBuf)], work_dir: &Path) -> Result<Vec<String>> {
         use tokio::process::Command;
         
+        // The linked library skips a process spawn and model load per page;
+        // GPU runs still go through the CLI to pass the OpenCL options
+        #[cfg(feature = "leptess")]
+        {
+            if !self.use_gpu {
+                let image_paths: Vec<PathBuf> = images.iter().map(|(_, path)| path.clone()).collect();
+                let (sender, receiver) = tokio::sync::oneshot::channel();
+                
+                self.ocr_pool().spawn(move || {
+                    let results: Vec<Result<String>> = image_paths
+                        .iter()
+                        .map(|path| ocr_image_in_process(path))
+                        .collect();
+                    let _ = sender.send(results);
+                });
+                
+                let results = receiver.await.context("OCR task panicked")?;
+                
+                // Like a failed tesseract run, a batch with no readable page is an error
+                if results.iter().all(|result| result.is_err()) {
+                    if let Some(Err(e)) = results.into_iter().next() {
+                        return Err(e);
+                    }
+                    return Ok(Vec::new());
+                }
+                
+                let texts = images
+                    .iter()
+                    .zip(results)
+                    .map(|((_, path), result)| {
+                        result.unwrap_or_else(|e| {
+                            warn!("OCR failed for {}: {}", path.display(), e);
+                            String::new()
+                        })
+                    })
+                    .collect();
+                return Ok(texts);
+            }
+        }
+        
+        // A list file lets one tesseract run load the model once for every page
+        let list_path = work_dir.join("pages.txt");
+        let list: String = images
+            .iter()
+            .map(|(_, path)| format!("{}\n", path.display()))
+            .collect();
+        tokio::fs::write(&list_path, list).await?;
+        
         let mut cmd = Command::new("tesseract");
         cmd.args([
-            image_path.to_str().unwrap(),
+            list_path.to_str().unwrap(),
             "stdout",
             "-l", "eng",
         ]);
@@ -122,14 +314,40 @@ impl OcrProcessor {
             .await
             .context("Failed to run tesseract")?;
         
-        if output.status.success() {
-            Ok(String::from_utf8_lossy(&output.stdout).to_string())
-        } else {
-            Err(anyhow::anyhow!(
+        if !output.status.success() {
+            return Err(anyhow::anyhow!(
                 "Tesseract failed: {}",
                 String::from_utf8_lossy(&output.stderr)
-            ))
+            ));
+        }
+        
+        // Tesseract ends each page's text with a form feed
+        let stdout = String::from_utf8_lossy(&output.stdout);
+        let texts: Vec<String> = stdout
+            .split('\x0c')
+            .take(images.len())
+            .map(str::to_string)
+            .collect();
+        
+        if texts.len() < images.len() {
+            warn!("Tesseract returned {} pages for {} images", texts.len(), images.len());
         }
+        
+        Ok(texts)
+    }
+    
+    /// Pool for in-process OCR, one thread per batch that may run at once
+    #[cfg(feature = "leptess")]
+    fn ocr_pool(&self) -> &'static rayon::ThreadPool {
+        OCR_POOL.get_or_init(|| {
+            rayon::ThreadPoolBuilder::new()
+                .num_threads(self.ocr_threads)
+                .thread_name(|index| format!("ocr-{}", index))
+                // A panic drops the batch's reply channel; keep the pool alive
+                .panic_handler(|_| error!("OCR worker panicked"))
+                .build()
+                .expect("Failed to start OCR thread pool")
+        })
     }
     
     /// Check if OCR tools are available
@@ -184,4 +402,22 @@ impl OcrProcessor {
         
         tesseract_available && pdftoppm_available
     }
-}
\ No newline at end of file
+}
+
+/// OCR an image with the calling pool thread's persistent Tesseract instance
+#[cfg(feature = "leptess")]
+fn ocr_image_in_process(image_path: &Path) -> Result<String> {
+    TESSERACT.with(|cell| {
+        let mut slot = cell.borrow_mut();
+        
+        if slot.is_none() {
+            let api = leptess::LepTess::new(None, "eng")
+                .context("Failed to initialise Tesseract")?;
+            *slot = Some(api);
+        }
+        
+        let api = slot.as_mut().unwrap();
+        api.set_image(image_path).context("Failed to load page image")?;
+        api.get_utf8_text().context("Tesseract returned invalid UTF-8")
+    })
+}
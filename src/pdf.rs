@@ -2,6 +2,14 @@ use anyhow::{Result, Context};
 use std::path::Path;
 use log::{info, warn};
 
+use crate::database::PageText;
+
+/// Leading pages probed for a text layer before extracting the rest
+const SAMPLE_PAGES: usize = 2;
+
+/// Non-whitespace characters a sampled page needs to count as text
+const SAMPLE_MIN_CHARS: usize = 20;
+
 pub struct PdfProcessor;
 
 impl PdfProcessor {
@@ -10,20 +18,40 @@ impl PdfProcessor {
     }
     
     /// Extract text directly from PDF using lopdf
-    pub fn extract_text_direct(&self, pdf_path: &Path) -> Result<(String, usize)> {
-        let document = lopdf::Document::load(pdf_path)
+    ///
+    /// The file is read once and both lopdf and the pdf-extract fallback
+    /// parse the same buffer.
+    pub fn extract_text_direct(&self, pdf_path: &Path) -> Result<(Vec<PageText>, usize)> {
+        let bytes = std::fs::read(pdf_path)
+            .context("Failed to read PDF file")?;
+        let document = lopdf::Document::load_mem(&bytes)
             .context("Failed to load PDF document")?;
         
-        let mut text = String::new();
+        let mut pages = Vec::new();
         let page_count = document.get_pages().len();
+        let mut sample_has_text = false;
         
-        for (page_num, _) in document.get_pages() {
+        for (index, (page_num, _)) in document.get_pages().into_iter().enumerate() {
+            // Scanned documents have no text layer; once the leading pages show
+            // none, skip parsing the remaining content streams. pdf-extract
+            // below still gets a try, since it decodes fonts lopdf cannot.
+            if index == SAMPLE_PAGES {
+                if !sample_has_text {
+                    info!("No text layer found by lopdf in the first {} pages of {}",
+                          SAMPLE_PAGES, pdf_path.display());
+                    break;
+                }
+                info!("Text layer found in {}, extracting all {} pages", pdf_path.display(), page_count);
+            }
+            
             match document.extract_text(&[page_num]) {
                 Ok(page_text) => {
+                    if index < SAMPLE_PAGES && non_space_len(&page_text) > SAMPLE_MIN_CHARS {
+                        sample_has_text = true;
+                    }
+                    
                     if !page_text.trim().is_empty() {
-                        text.push_str(&format!("--- Page {} ---\n", page_num));
-                        text.push_str(&page_text);
-                        text.push_str("\n\n");
+                        pages.push(PageText { page_num: page_num as usize, text: page_text });
                     }
                 }
                 Err(e) => {
@@ -33,12 +61,14 @@ impl PdfProcessor {
         }
         
         // Try pdf-extract as fallback if lopdf didn't work well
-        if text.trim().len() < 50 {
-            match pdf_extract::extract_text(pdf_path) {
+        let text_len = total_text_len(&pages);
+        if text_len < 50 {
+            match pdf_extract::extract_text_from_mem(&bytes) {
                 Ok(extracted) => {
-                    if extracted.trim().len() > text.trim().len() {
+                    if extracted.trim().len() > text_len {
                         info!("Using pdf-extract fallback for {}", pdf_path.display());
-                        return Ok((extracted, page_count));
+                        // pdf-extract yields one document-wide string, kept as a single page
+                        return Ok((vec![PageText { page_num: 1, text: extracted }], page_count));
                     }
                 }
                 Err(e) => {
@@ -47,12 +77,12 @@ impl PdfProcessor {
             }
         }
         
-        Ok((text, page_count))
+        Ok((pages, page_count))
     }
     
     /// Check if PDF has substantial extractable text
-    pub fn has_extractable_text(&self, text: &str) -> bool {
-        text.trim().len() > 50
+    pub fn has_extractable_text(&self, pages: &[PageText]) -> bool {
+        total_text_len(pages) > 50
     }
     
     /// Get PDF page count
@@ -62,4 +92,14 @@ impl PdfProcessor {
         
         Ok(document.get_pages().len())
     }
+}
+
+/// Combined length of page text, ignoring surrounding whitespace
+fn total_text_len(pages: &[PageText]) -> usize {
+    pages.iter().map(|page| page.text.trim().len()).sum()
+}
+
+/// Number of non-whitespace characters in `text`
+fn non_space_len(text: &str) -> usize {
+    text.chars().filter(|c| !c.is_whitespace()).count()
 }
\ No newline at end of file
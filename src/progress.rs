@@ -26,6 +26,11 @@ impl ProgressTracker {
         }
     }
     
+    /// Grow the total as files are discovered
+    pub fn inc_length(&self, delta: u64) {
+        self.bar.inc_length(delta);
+    }
+    
     pub fn increment(&self) {
         let count = self.completed.fetch_add(1, Ordering::SeqCst) + 1;
         self.bar.set_position(count as u64);
@@ -54,7 +54,7 @@ pub enum QueryCommand {
 }
 
 pub async fn run_query(args: QueryArgs) -> Result<()> {
-    let db = database::Database::new(&args.database).await?;
+    let db = database::Database::open_read_only(&args.database).await?;
     
     match args.command {
         QueryCommand::Stats => {
@@ -69,6 +69,15 @@ pub async fn run_query(args: QueryArgs) -> Result<()> {
                 println!("Success rate: {:.1}%", (stats.successful as f64 / stats.total as f64) * 100.0);
             }
             println!("Average processing time: {:.2}s", stats.avg_processing_time);
+            println!("File size (successful): avg {:.0} bytes, min {} bytes, max {} bytes",
+                     stats.avg_file_size, stats.min_file_size, stats.max_file_size);
+            
+            if !stats.methods.is_empty() {
+                println!("\nExtraction methods:");
+                for (method, count) in &stats.methods {
+                    println!("  {}: {}", method, count);
+                }
+            }
         }
         
         QueryCommand::Search { query, limit } => {
@@ -80,20 +89,35 @@ pub async fn run_query(args: QueryArgs) -> Result<()> {
             for result in results {
                 println!("File: {}", result.file_path);
                 println!("Method: {}", result.extraction_method);
+                println!("Page: {}", result.page_num);
                 println!("Timestamp: {}", result.timestamp);
-                println!("Preview: {}...", result.preview);
+                println!("Preview: {}", result.preview);
                 println!("{}", "-".repeat(40));
             }
         }
         
-        QueryCommand::List { method: _, include_failed: _ } => {
-            // TODO: Implement list functionality
-            println!("List functionality not yet implemented");
+        QueryCommand::List { method, include_failed } => {
+            let files = db.list_files(method.as_deref(), include_failed).await?;
+            
+            println!("Processed files ({}):", files.len());
+            println!("{}", "=".repeat(60));
+            
+            for file in files {
+                let status = if file.success { "ok" } else { "failed" };
+                println!("{} [{}] {}", file.timestamp, file.extraction_method, file.file_path);
+                println!("  Status: {}, pages: {}, time: {:.2}s",
+                         status,
+                         file.page_count.unwrap_or(0),
+                         file.processing_time_seconds.unwrap_or(0.0));
+                if let Some(error) = file.error_message {
+                    println!("  Error: {}", error);
+                }
+            }
         }
         
-        QueryCommand::Export { output: _, include_text: _ } => {
-            // TODO: Implement export functionality
-            println!("Export functionality not yet implemented");
+        QueryCommand::Export { output, include_text } => {
+            let count = db.export_json(&output, include_text).await?;
+            println!("Exported {} records to {}", count, output.display());
         }
     }
     